@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import ctypes
+from collections import OrderedDict
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from importlib import resources
 from typing import Final, NewType, Protocol, cast
@@ -28,6 +31,8 @@ from AppKit import (  # type: ignore[import-untyped]
     NSSplitView,
     NSSplitViewDividerStyleThin,
     NSStatusWindowLevel,
+    NSTextStorage,
+    NSTextStorageEditedCharacters,
     NSTextView,
     NSViewHeightSizable,
     NSViewWidthSizable,
@@ -36,10 +41,12 @@ from AppKit import (  # type: ignore[import-untyped]
     NSWindowStyleMaskResizable,
     NSWindowStyleMaskTitled,
 )
-from Foundation import NSMakeRect, NSNotification, NSObject  # type: ignore[import-untyped]
+from Foundation import NSMakeRange, NSMakeRect, NSNotification, NSObject, NSTimer  # type: ignore[import-untyped]
+from PyObjCTools import AppHelper  # type: ignore[import-untyped]
 from rumps import MenuItem, events  # type: ignore[import-untyped]
 
-from .calculator import render_results
+from .calculator import render_line, render_results
+from .lines import LineBuffer
 
 ObjCId = NewType("ObjCId", object)
 
@@ -73,6 +80,12 @@ PANEL_GEOMETRY: Final[PanelGeometry] = PanelGeometry(
 
 _STATUS_ICON_RESOURCE: Final[str] = "ph_switch_mb_icon.svg"
 _STATUS_ICON_SIZE: Final[tuple[float, float]] = (18.0, 18.0)
+_RENDER_DEBOUNCE_SECONDS: Final[float] = 0.2
+_LINE_CACHE_SIZE: Final[int] = 512
+_MAX_RENDERED_LINES: Final[int] = 5000
+# qos_class_t values from <sys/qos.h>.
+_QOS_CLASS_USER_INTERACTIVE: Final[int] = 0x21
+_QOS_CLASS_UTILITY: Final[int] = 0x11
 
 
 def _load_status_icon() -> NSImage | None:
@@ -93,6 +106,16 @@ def _load_status_icon() -> NSImage | None:
     return image
 
 
+def _set_thread_qos(qos_class: int) -> None:
+    """Assign a quality-of-service class to the calling thread, if supported."""
+
+    try:
+        libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib")
+        libsystem.pthread_set_qos_class_self_np(qos_class, 0)
+    except (OSError, AttributeError):
+        return
+
+
 class _StatusButtonHandler(NSObject):
     """Objective-C bridge that reacts to status item clicks."""
 
@@ -142,6 +165,15 @@ class _TextChangeObserver(NSObject):
         text_view = cast(NSTextView, ns_notification.object())  # type: ignore[no-any-return]
         self._app.handle_text_change(text_view)
 
+    def textStorage_didProcessEditing_range_changeInLength_(  # noqa: N802
+        self, text_storage: NSTextStorage, edited_mask: int, edited_range: ObjCId, delta: int
+    ) -> None:
+        if edited_mask & NSTextStorageEditedCharacters:
+            self._app.handle_storage_edit(text_storage, edited_range, delta)
+
+    def renderPendingInput_(self, _timer: ObjCId) -> None:  # noqa: N802
+        self._app.flush_pending_render()
+
 
 class _SplitViewDelegate(NSObject):
     """Constrains the split view so both panes remain visible."""
@@ -188,6 +220,21 @@ class ToolbarApp(rumps.App):
         self.menu: list[MenuItem] = []
         self._text_view: NSTextView | None = None
         self._result_view: NSTextView | None = None
+        self._pending_render: NSTimer | None = None
+        self._line_cache: OrderedDict[str, str] = OrderedDict()
+        # The empty result view holds a single blank line.
+        self._last_outputs: list[str] = [""]
+        self._last_input_hash: int | None = None
+        self._input_lines = LineBuffer()
+        # Keep typing on the main thread ahead of the render worker to avoid priority inversion.
+        _set_thread_qos(_QOS_CLASS_USER_INTERACTIVE)
+        self._render_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="ph-switch-render",
+            initializer=_set_thread_qos,
+            initargs=(_QOS_CLASS_UTILITY,),
+        )
+        self._render_generation = 0
         self._panel_delegate = _StatusButtonHandler.alloc().initWithApp_(self)
         self._text_delegate = _TextChangeObserver.alloc().initWithApp_(self)
         self._split_delegate = _SplitViewDelegate.alloc().initWithRatios_(self._minimum_split_widths())
@@ -208,19 +255,19 @@ class ToolbarApp(rumps.App):
     def _build_panel(self) -> NSPanel:
         panel = _create_panel(PANEL_GEOMETRY)
         content_bounds = cast(_Rect, panel.contentView().bounds())
+        width = content_bounds.size.width
+        height = content_bounds.size.height
+        input_width = width * PANEL_GEOMETRY.split_ratio
         split_view = _create_split_view(content_bounds, self._split_delegate)
 
-        input_view = _create_input_view(content_bounds, self._text_delegate)
-        result_view = _create_result_view(content_bounds, input_view)
+        input_view = _create_input_view(input_width, height, self._text_delegate)
+        result_view = _create_result_view(width - input_width, height, input_view)
 
         split_view.addSubview_(input_view.scroll)
         split_view.addSubview_(result_view.scroll)
         split_view.setHoldingPriority_forSubviewAtIndex_(260.0, 0)
         split_view.setHoldingPriority_forSubviewAtIndex_(250.0, 1)
-        split_view.setPosition_ofDividerAtIndex_(
-            0,
-            content_bounds.size.width * PANEL_GEOMETRY.split_ratio,
-        )
+        split_view.setPosition_ofDividerAtIndex_(0, input_width)
         split_view.adjustSubviews()
         if hasattr(split_view, "layoutSubtreeIfNeeded"):
             split_view.layoutSubtreeIfNeeded()
@@ -228,6 +275,8 @@ class ToolbarApp(rumps.App):
 
         panel.setContentView_(split_view)
         panel.setInitialFirstResponder_(input_view.text)
+        input_view.text.textStorage().setDelegate_(self._text_delegate)
+        self._input_lines.reset(input_view.text.string())
         self._text_view = input_view.text
         self._result_view = result_view.text
         return panel
@@ -314,14 +363,13 @@ class ToolbarApp(rumps.App):
 
     def toggle_panel(self) -> None:
         if self._panel.isVisible():
-            ns_app = NSApplication.sharedApplication()
-            ns_app.setActivationPolicy_(NSApplicationActivationPolicyAccessory)
+            _ensure_accessory_policy(NSApplication.sharedApplication())
             self._panel.orderOut_(None)
             return
 
         self._position_panel()
         ns_app = NSApplication.sharedApplication()
-        ns_app.setActivationPolicy_(NSApplicationActivationPolicyAccessory)
+        _ensure_accessory_policy(ns_app)
         ns_app.activateIgnoringOtherApps_(True)
         self._panel.makeKeyAndOrderFront_(None)
         if self._text_view is not None:
@@ -329,6 +377,7 @@ class ToolbarApp(rumps.App):
             window = self._text_view.window()
             if window is not None:
                 window.makeFirstResponder_(self._text_view)
+        self._cancel_pending_render()
         self._update_result_from_input()
 
     def _position_panel(self) -> None:
@@ -356,15 +405,112 @@ class ToolbarApp(rumps.App):
     def handle_text_change(self, text_view: NSTextView) -> None:
         if text_view is not self._text_view:
             return
+        # Coalesce bursts of keystrokes into a single render once typing pauses.
+        self._cancel_pending_render()
+        self._pending_render = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+            _RENDER_DEBOUNCE_SECONDS,
+            self._text_delegate,
+            "renderPendingInput:",
+            None,
+            False,
+        )
+
+    def handle_storage_edit(self, text_storage: NSTextStorage, edited_range: ObjCId, delta: int) -> None:
+        """Keep the input line index in sync, reading back only the edited lines."""
+
+        def _read(location: int, length: int) -> str:
+            return str(text_storage.attributedSubstringFromRange_(NSMakeRange(location, length)).string())
+
+        self._input_lines.apply_edit(edited_range.location, edited_range.length, delta, _read)
+
+    def flush_pending_render(self) -> None:
+        self._pending_render = None
         self._update_result_from_input()
 
+    def _cancel_pending_render(self) -> None:
+        if self._pending_render is not None:
+            self._pending_render.invalidate()
+            self._pending_render = None
+
     def _update_result_from_input(self) -> None:
         if self._text_view is None or self._result_view is None:
             return
 
-        lines = self._text_view.string().splitlines()
-        outputs = render_results(lines)
-        self._result_view.setString_("\n".join(outputs))
+        # Snapshot the lines on the main thread; parsing and conversion run on the worker.
+        # Large pastes are capped so the worst-case render stays bounded.
+        all_lines = self._input_lines.lines
+        lines = tuple(all_lines[:_MAX_RENDERED_LINES])
+        hidden = len(all_lines) - len(lines)
+        lines_hash = hash((lines, hidden))
+        if lines_hash == self._last_input_hash:
+            return
+        self._last_input_hash = lines_hash
+
+        self._render_generation += 1
+        self._render_executor.submit(self._render_in_background, self._render_generation, lines, hidden)
+
+    def _render_in_background(self, generation: int, lines: Sequence[str], hidden: int) -> None:
+        # Preallocate (including the overflow marker slot) so blank lines cost no work at all.
+        outputs = [""] * (len(lines) + (1 if hidden else 0))
+        for index, line in enumerate(lines):
+            if line:
+                outputs[index] = self._render_cached(line)
+        if hidden:
+            outputs[-1] = _overflow_marker(hidden)
+        AppHelper.callAfter(self._apply_outputs, generation, outputs)
+
+    def _apply_outputs(self, generation: int, outputs: list[str]) -> None:
+        """Update the result view, touching only the lines whose output changed."""
+
+        if generation != self._render_generation or self._result_view is None:
+            # A newer render has been scheduled; drop this stale result.
+            return
+
+        previous = self._last_outputs
+        self._last_outputs = outputs
+        # Bracket every mutation so AppKit coalesces layout into a single pass.
+        storage = self._result_view.textStorage()
+        storage.beginEditing()
+        try:
+            if not outputs or not previous:
+                self._result_view.setString_("\n".join(outputs))
+                return
+
+            # Outputs are ASCII, so Python lengths match the UTF-16 offsets NSRange expects.
+            location = 0
+            for old, new in zip(previous, outputs, strict=False):
+                if old != new:
+                    storage.replaceCharactersInRange_withString_(NSMakeRange(location, len(old)), new)
+                location += len(new) + 1
+
+            # Replace everything after the last shared line to append or drop trailing lines.
+            shared = min(len(previous), len(outputs))
+            if len(previous) != len(outputs):
+                tail_start = location - 1
+                tail = "".join("\n" + line for line in outputs[shared:])
+                storage.replaceCharactersInRange_withString_(
+                    NSMakeRange(tail_start, storage.length() - tail_start),
+                    tail,
+                )
+        finally:
+            storage.endEditing()
+
+    def _render_cached(self, line: str) -> str:
+        """Render a line, reusing the previous result when the text is unchanged.
+
+        Only called from the render worker, so the cache needs no locking.
+        """
+
+        cached = self._line_cache.get(line)
+        if cached is not None:
+            self._line_cache.move_to_end(line)
+            return cached
+
+        output = render_line(line)
+        self._line_cache[line] = output
+        if len(self._line_cache) > _LINE_CACHE_SIZE:
+            self._line_cache.popitem(last=False)
+        return output
 
     def show_context_menu(self) -> None:
         if self._context_menu is None:
@@ -375,6 +521,8 @@ class ToolbarApp(rumps.App):
     def quit_app(self) -> None:
         if self._panel.isVisible():
             self._panel.orderOut_(None)
+        self._cancel_pending_render()
+        self._render_executor.shutdown(wait=False, cancel_futures=True)
         rumps.quit_application()
 
     def _build_context_menu(self) -> NSMenu | None:
@@ -392,6 +540,11 @@ class ToolbarApp(rumps.App):
         return menu
 
 
+def _ensure_accessory_policy(ns_app: NSApplication) -> None:
+    if ns_app.activationPolicy() != NSApplicationActivationPolicyAccessory:
+        ns_app.setActivationPolicy_(NSApplicationActivationPolicyAccessory)
+
+
 @dataclass
 class _TextViewBundle:
     """Holds a text view together with its scroll view."""
@@ -428,22 +581,20 @@ def _create_split_view(bounds: _Rect, delegate: _SplitViewDelegate) -> NSSplitVi
     return split_view
 
 
-def _create_input_view(bounds: _Rect, delegate: _TextChangeObserver) -> _TextViewBundle:
-    width = bounds.size.width * PANEL_GEOMETRY.split_ratio
-    frame = cast(_Rect, NSMakeRect(0.0, 0.0, width, bounds.size.height))
+def _create_input_view(width: float, height: float, delegate: _TextChangeObserver) -> _TextViewBundle:
+    frame = cast(_Rect, NSMakeRect(0.0, 0.0, width, height))
     text_view = _build_text_view(frame, editable=True, delegate=delegate)
     scroll = _build_scroll_view(frame, text_view)
     return _TextViewBundle(text=text_view, scroll=scroll)
 
 
-def _create_result_view(bounds: _Rect, input_bundle: _TextViewBundle) -> _TextViewBundle:
-    width = bounds.size.width * (1.0 - PANEL_GEOMETRY.split_ratio)
-    frame = cast(_Rect, NSMakeRect(0.0, 0.0, width, bounds.size.height))
-    text_view = _build_text_view(frame, editable=False, delegate=None)
+def _create_result_view(width: float, height: float, input_bundle: _TextViewBundle) -> _TextViewBundle:
+    frame = cast(_Rect, NSMakeRect(0.0, 0.0, width, height))
+    text_view = _build_text_view(frame, editable=False, delegate=None, read_only_display=True)
     if input_bundle.text.drawsBackground():
         text_view.setDrawsBackground_(True)
         text_view.setBackgroundColor_(input_bundle.text.backgroundColor())
-    scroll = _build_scroll_view(frame, text_view)
+    scroll = _build_scroll_view(frame, text_view, horizontal_scroller=False)
     return _TextViewBundle(text=text_view, scroll=scroll)
 
 
@@ -452,14 +603,15 @@ def _build_text_view(
     *,
     editable: bool,
     delegate: _TextChangeObserver | None,
+    read_only_display: bool = False,
 ) -> NSTextView:
     text_view = NSTextView.alloc().initWithFrame_(frame)
     text_view.setRichText_(False)
-    text_view.setUsesFindPanel_(True)
+    text_view.setUsesFindPanel_(not read_only_display)
     text_view.setAutomaticQuoteSubstitutionEnabled_(False)
     text_view.setAutomaticDashSubstitutionEnabled_(False)
     text_view.setAutoresizingMask_(NSViewWidthSizable | NSViewHeightSizable)
-    text_view.setHorizontallyResizable_(True)
+    text_view.setHorizontallyResizable_(not read_only_display)
     text_view.setVerticallyResizable_(True)
     text_view.setMinSize_((0.0, 0.0))
     text_view.setMaxSize_((float("inf"), float("inf")))
@@ -467,24 +619,45 @@ def _build_text_view(
     text_view.setSelectable_(True)
     if delegate is not None:
         text_view.setDelegate_(delegate)
+    if read_only_display:
+        # The result pane only displays short numbers; skip layout work meant for editing.
+        text_view.setFieldEditor_(False)
+        layout_manager = text_view.layoutManager()
+        layout_manager.setAllowsNonContiguousLayout_(True)
+        layout_manager.setBackgroundLayoutEnabled_(False)
     return text_view
 
 
-def _build_scroll_view(frame: _Rect, document_view: NSTextView) -> NSScrollView:
+def _build_scroll_view(
+    frame: _Rect,
+    document_view: NSTextView,
+    *,
+    horizontal_scroller: bool = True,
+) -> NSScrollView:
     scroll = NSScrollView.alloc().initWithFrame_(frame)
     scroll.setBorderType_(NSBezelBorder)
     scroll.setHasVerticalScroller_(True)
-    scroll.setHasHorizontalScroller_(True)
+    scroll.setHasHorizontalScroller_(horizontal_scroller)
     scroll.setAutohidesScrollers_(True)
     scroll.setAutoresizingMask_(NSViewWidthSizable | NSViewHeightSizable)
     scroll.setDocumentView_(document_view)
     return scroll
 
 
-def update_results(text: str) -> Sequence[str]:
-    """Convenience wrapper primarily used in tests."""
+def _overflow_marker(hidden: int) -> str:
+    return f"... ({hidden:,} more lines)"
+
 
-    return render_results(text.splitlines())
+def update_results(text: str) -> Sequence[str]:
+    """Convenience wrapper primarily used in tests; splits and caps lines like the panel does."""
+
+    lines = LineBuffer(text).lines
+    shown = lines[:_MAX_RENDERED_LINES]
+    outputs = list(render_results(shown))
+    hidden = len(lines) - len(shown)
+    if hidden:
+        outputs.append(_overflow_marker(hidden))
+    return outputs
 
 
 __all__ = ["ToolbarApp", "update_results"]
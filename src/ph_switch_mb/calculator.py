@@ -2,47 +2,66 @@
 
 from __future__ import annotations
 
+import functools
 import math
 import re
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from typing import Final
 
-from ph_units.converter import UnitTypeNameNotFound, convert
-from ph_units.parser import parse_input
-
 _CONNECTOR_PATTERN: Final[re.Pattern[str]] = re.compile(r"\b(?:to|as)\b", re.IGNORECASE)
+_CONNECTORS: Final[tuple[str, ...]] = (" to ", " as ")
 _FORMAT_SPEC: Final[str] = ",.12g"
+# Inputs used to detect pure scale conversions (value * factor); the third verifies the fit.
+_SCALE_PROBES: Final[tuple[float, float, float]] = (0.0, 1.0, 10.0)
+# Integers below 1e12 have at most 12 digits, so the integer path matches _FORMAT_SPEC exactly.
+_INTEGER_FORMAT_LIMIT: Final[float] = 1e12
 
 
 def render_results(lines: Iterable[str]) -> Sequence[str]:
     """Convert each provided line and return printable results."""
 
-    outputs: list[str] = []
-    for line in lines:
-        expression = line.strip()
-        if not expression:
-            outputs.append("")
-            continue
-
-        try:
-            value = _convert_expression(expression)
-        except (ValueError, UnitTypeNameNotFound):
-            outputs.append("")
-            continue
-        except Exception:
-            # Defensive: PH_units can raise generic exceptions for bad inputs.
-            outputs.append("")
-            continue
-
-        outputs.append(_format_value(value))
+    if not isinstance(lines, Sequence):
+        lines = list(lines)
+    outputs = [""] * len(lines)
+    for index, line in enumerate(lines):
+        if line:
+            outputs[index] = render_line(line)
     return outputs
 
 
+def render_line(line: str) -> str:
+    """Convert a single line, returning an empty string when it is not convertible."""
+
+    expression = line.strip()
+    if not _is_plausible_expression(expression):
+        return ""
+
+    # Load PH_units outside the try so a missing dependency fails loudly instead of rendering blanks.
+    _load_ph_units()
+    try:
+        value = _convert_expression(expression)
+    except Exception:
+        # Defensive: covers our ValueErrors plus UnitTypeNameNotFound and generic PH_units errors.
+        return ""
+
+    return _format_value(value)
+
+
+def _is_plausible_expression(expression: str) -> bool:
+    """Cheaply reject lines that cannot be conversions before invoking PH_units."""
+
+    if not any(char.isdigit() for char in expression):
+        return False
+    lowered = expression.lower()
+    # Loose substring checks so the regex fallback in _split_connector still sees tab-delimited connectors.
+    return "to" in lowered or "as" in lowered
+
+
 def _convert_expression(expression: str) -> float:
     """Parse a single conversion request and return the converted value."""
 
-    parts = _CONNECTOR_PATTERN.split(expression, maxsplit=1)
-    if len(parts) != 2:
+    parts = _split_connector(expression)
+    if parts is None:
         raise ValueError("Conversion target not provided")
 
     source_text, target_text = parts
@@ -51,6 +70,7 @@ def _convert_expression(expression: str) -> float:
     if not source_text or not target_text:
         raise ValueError("Incomplete conversion expression")
 
+    _, parse_input = _load_ph_units()
     value_text, source_unit = parse_input(source_text)
     if not value_text or source_unit is None:
         raise ValueError("Missing value or source unit")
@@ -62,28 +82,102 @@ def _convert_expression(expression: str) -> float:
     if not target_text:
         raise ValueError("Conversion target not provided")
 
+    result = _cached_convert(value_text, source_unit, target_text)
+    if result is None:
+        raise ValueError("Conversion yielded no result")
+
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_convert(value_text: str, source_unit: str, target: str) -> float | None:
+    """Convert a parsed value, memoised so repeated lines skip PH_units entirely."""
+
     try:
         numeric_value = float(value_text)
     except ValueError as exc:
         raise ValueError("Invalid numeric value") from exc
 
-    result = convert(numeric_value, source_unit, target_text)
-    if result is None:
-        raise ValueError("Conversion yielded no result")
+    factor = _scale_factor(source_unit, target)
+    if factor is not None:
+        return numeric_value * factor
 
+    convert, _ = _load_ph_units()
+    result = convert(numeric_value, source_unit, target)
+    if result is None:
+        return None
     return float(result)
 
 
+@functools.lru_cache(maxsize=1024)
+def _scale_factor(source_unit: str, target: str) -> float | None:
+    """Return the factor for a unit pair, or None if it is not a pure scale conversion.
+
+    PH_units is probed once per pair so later values reduce to a single multiply. Pairs with an
+    offset (temperatures) stay on the full conversion path, since rebuilding them from probes
+    loses precision near zero (e.g. 32 F to C). Reciprocal pairs such as R-value to U-value fail
+    the probe as well.
+    """
+
+    convert, _ = _load_ph_units()
+    try:
+        results = [convert(probe, source_unit, target) for probe in _SCALE_PROBES]
+    except Exception:
+        return None
+    if any(result is None for result in results):
+        return None
+
+    at_zero, at_one, at_ten = (float(result) for result in results)
+    if at_zero != 0.0 or not math.isfinite(at_one) or not math.isfinite(at_ten):
+        return None
+    if not math.isclose(at_ten, at_one * _SCALE_PROBES[2], rel_tol=1e-9):
+        return None
+    return at_one
+
+
+@functools.cache
+def _load_ph_units() -> tuple[Callable[[float, str, str], float | None], Callable[[str], tuple[str, str | None]]]:
+    """Import PH_units on first use so launching the app does not pay for it."""
+
+    from ph_units.converter import convert
+    from ph_units.parser import parse_input
+
+    return convert, parse_input
+
+
+def _split_connector(expression: str) -> tuple[str, str] | None:
+    """Split an expression at its first connector into source and target text."""
+
+    # Fast path: plain substring search for the common space-delimited form.
+    if expression.isascii():
+        lowered = expression.lower()
+        matches = [(lowered.find(connector), connector) for connector in _CONNECTORS]
+        found = [(index, connector) for index, connector in matches if index != -1]
+        if found:
+            index, connector = min(found)
+            return expression[:index], expression[index + len(connector) :]
+
+    # Fallback for connectors next to other whitespace, punctuation or the string edges.
+    parts = _CONNECTOR_PATTERN.split(expression, maxsplit=1)
+    if len(parts) != 2:
+        return None
+    return parts[0], parts[1]
+
+
+@functools.lru_cache(maxsize=4096)
 def _format_value(value: float) -> str:
     """Format numeric results for display without appending unit labels."""
 
     if math.isnan(value) or math.isinf(value):
         return str(value)
 
+    if value.is_integer() and abs(value) < _INTEGER_FORMAT_LIMIT:
+        return format(int(value), ",")
+
     formatted = format(value, _FORMAT_SPEC)
     if formatted.endswith("."):
         return formatted[:-1]
     return formatted
 
 
-__all__ = ["render_results"]
+__all__ = ["render_line", "render_results"]
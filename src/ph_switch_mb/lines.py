@@ -0,0 +1,88 @@
+"""Incrementally maintained line index for the input text view."""
+
+from __future__ import annotations
+
+import bisect
+import re
+from collections.abc import Callable, Sequence
+from typing import Final
+
+# The paragraph and line separators NSTextView breaks on; CRLF counts as one separator.
+_LINE_BREAK: Final[re.Pattern[str]] = re.compile("\r\n|[\n\r\x85\u2028\u2029]")
+
+
+def _utf16_length(text: str) -> int:
+    """Return the length of ``text`` in UTF-16 code units, as used by NSRange."""
+
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _split_lines(text: str, offset: int) -> tuple[list[str], list[int]]:
+    """Split ``text`` into lines and their UTF-16 start offsets, beginning at ``offset``."""
+
+    lines: list[str] = []
+    starts: list[int] = []
+    position = 0
+    for match in _LINE_BREAK.finditer(text):
+        line = text[position : match.start()]
+        lines.append(line)
+        starts.append(offset)
+        offset += _utf16_length(line) + _utf16_length(match.group())
+        position = match.end()
+    lines.append(text[position:])
+    starts.append(offset)
+    return lines, starts
+
+
+class LineBuffer:
+    """Keeps a list of lines in sync with a text buffer edited in place.
+
+    Offsets are UTF-16 code units so the edited ranges reported by ``NSTextStorage``
+    can be applied directly. Lines break on the same separators NSTextView draws as
+    line breaks (``\\n``, ``\\r``, ``\\r\\n``, U+0085, U+2028 and U+2029). Unlike
+    ``str.splitlines`` a trailing separator yields a trailing empty line, matching the
+    empty last line the text view shows.
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self._lines: list[str] = []
+        self._starts: list[int] = []
+        self.reset(text)
+
+    @property
+    def lines(self) -> Sequence[str]:
+        return self._lines
+
+    def reset(self, text: str) -> None:
+        """Rebuild the index from the full text."""
+
+        self._lines, self._starts = _split_lines(text, 0)
+
+    def apply_edit(self, location: int, length: int, delta: int, read: Callable[[int, int], str]) -> None:
+        """Splice a single edit into the buffer.
+
+        ``location`` and ``length`` describe the edited range in the updated text and ``delta``
+        the change in total length. ``read(location, length)`` must return the updated text for
+        a range; it is only asked for the lines around the edit.
+        """
+
+        old_end = location + length - delta
+        # Re-read one neighbouring line on each side so an edit next to a separator
+        # (e.g. completing or splitting a CRLF pair) is re-split as a whole.
+        first = max(bisect.bisect_right(self._starts, location) - 2, 0)
+        last = min(bisect.bisect_right(self._starts, old_end), len(self._starts) - 1)
+
+        region_start = self._starts[first]
+        region_end = self._starts[last] + _utf16_length(self._lines[last])
+
+        new_lines, new_starts = _split_lines(read(region_start, region_end + delta - region_start), region_start)
+        self._lines[first : last + 1] = new_lines
+        self._starts[first : last + 1] = new_starts
+        if delta:
+            tail = first + len(new_lines)
+            self._starts[tail:] = [start + delta for start in self._starts[tail:]]
+
+
+__all__ = ["LineBuffer"]
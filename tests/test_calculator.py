@@ -32,3 +32,10 @@ def test_update_results_preserves_line_structure() -> None:
     assert outputs[1] == ""
     assert outputs[2] == ""
     assert _as_float(outputs[3]) == pytest.approx(304.8, rel=1e-6)
+
+
+def test_update_results_splits_lines_like_the_text_view() -> None:
+    outputs = update_results("5 m to ft\r12 in to mm\n")
+    assert len(outputs) == 3
+    assert _as_float(outputs[1]) == pytest.approx(304.8, rel=1e-6)
+    assert outputs[2] == ""
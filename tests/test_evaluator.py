@@ -1,6 +1,9 @@
+import sys
+
 import pytest
 
-from ph_switch_mb.calculator import render_results
+from ph_switch_mb import calculator
+from ph_switch_mb.calculator import render_line, render_results
 
 
 def _as_float(text: str) -> float:
@@ -22,3 +25,64 @@ def test_render_results_rejects_unknown_units() -> None:
 def test_render_results_strips_trailing_punctuation() -> None:
     output = render_results(["12 inches to mm."])
     assert _as_float(output[0]) == pytest.approx(304.8, rel=1e-6)
+
+
+def test_render_line_matches_render_results() -> None:
+    lines = ["5 m to ft", "", "bad input"]
+    assert [render_line(line) for line in lines] == list(render_results(lines))
+
+
+def test_render_results_accepts_mixed_case_and_tab_connectors() -> None:
+    assert _as_float(render_results(["5 m TO ft"])[0]) == pytest.approx(16.4041995, rel=1e-6)
+    assert _as_float(render_results(["5 m\tto ft"])[0]) == pytest.approx(16.4041995, rel=1e-6)
+
+
+def test_render_results_skips_notes_without_numbers() -> None:
+    assert render_results(["notes to self", "ft as m"]) == ["", ""]
+
+
+def test_render_results_formats_whole_numbers_with_grouping() -> None:
+    assert render_results(["1000 mm to m", "1000 m to mm"]) == ["1", "1,000,000"]
+
+
+def test_render_results_handles_offset_and_reciprocal_units() -> None:
+    assert render_results(["100 C to F", "0 C to F", "32 F to C"]) == ["212", "32", "0"]
+    r_to_u = _as_float(render_results(["5 R-IP to U-SI"])[0])
+    assert r_to_u == pytest.approx(1.0 / (5 * 0.176110), rel=1e-4)
+
+
+def test_render_results_raises_when_ph_units_is_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    calculator._load_ph_units.cache_clear()
+    monkeypatch.setitem(sys.modules, "ph_units.converter", None)
+    try:
+        with pytest.raises(ImportError):
+            render_results(["5 m to ft"])
+    finally:
+        calculator._load_ph_units.cache_clear()
+
+
+def test_scale_factor_only_covers_pure_scale_pairs() -> None:
+    assert calculator._scale_factor("m", "ft") == pytest.approx(3.2808399, rel=1e-6)
+    assert calculator._scale_factor("C", "F") is None
+    assert calculator._scale_factor("R-IP", "U-SI") is None
+
+
+def test_scale_factor_skips_convert_for_repeated_pairs(monkeypatch: pytest.MonkeyPatch) -> None:
+    convert, parse_input = calculator._load_ph_units()
+    calls: list[float] = []
+
+    def _counting_convert(value: float, source_unit: str, target: str) -> float | None:
+        calls.append(value)
+        return convert(value, source_unit, target)
+
+    monkeypatch.setattr(calculator, "_load_ph_units", lambda: (_counting_convert, parse_input))
+    calculator._scale_factor.cache_clear()
+    calculator._cached_convert.cache_clear()
+
+    outputs = render_results(["5 m to ft", "7 m to ft", "9 m to ft"])
+    assert _as_float(outputs[2]) == pytest.approx(29.5275591, rel=1e-6)
+    assert calls == [0.0, 1.0, 10.0]
+
+
+def test_render_results_accepts_generators() -> None:
+    assert render_results(line for line in ["", "bad input"]) == ["", ""]
@@ -0,0 +1,63 @@
+import pytest
+
+from ph_switch_mb.lines import LineBuffer
+
+
+def _edit(buffer: LineBuffer, text: str, start: int, end: int, replacement: str) -> str:
+    """Apply a replacement the way NSTextStorage reports it (UTF-16 offsets)."""
+
+    units = text.encode("utf-16-le")
+    inserted = replacement.encode("utf-16-le")
+    updated = (units[: start * 2] + inserted + units[end * 2 :]).decode("utf-16-le")
+
+    def read(location: int, length: int) -> str:
+        return updated.encode("utf-16-le")[location * 2 : (location + length) * 2].decode("utf-16-le")
+
+    delta = (len(inserted) - (end - start) * 2) // 2
+    buffer.apply_edit(start, len(inserted) // 2, delta, read)
+    return updated
+
+
+def test_line_buffer_splits_on_newlines() -> None:
+    assert list(LineBuffer("5 m to ft\n\n12 in to mm").lines) == ["5 m to ft", "", "12 in to mm"]
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "replacement"),
+    [
+        (3, 3, "x"),  # insert inside a line
+        (9, 9, "\n"),  # split a line at its end
+        (9, 10, ""),  # join two lines
+        (0, 0, "1 ft to m\n"),  # insert a line at the top
+        (2, 14, "as"),  # replace across lines
+        (22, 22, "\nnew"),  # append a line at the end
+        (0, 22, ""),  # clear everything
+    ],
+)
+def test_line_buffer_tracks_edits(start: int, end: int, replacement: str) -> None:
+    text = "5 m to ft\n\n12 in to mm"
+    buffer = LineBuffer(text)
+    updated = _edit(buffer, text, start, end, replacement)
+    assert list(buffer.lines) == updated.split("\n")
+
+
+def test_line_buffer_handles_non_bmp_characters() -> None:
+    text = "\U0001f600 note\n5 m to ft"
+    buffer = LineBuffer(text)
+    text = _edit(buffer, text, 8, 8, "\n")
+    text = _edit(buffer, text, 9, 9, "1")
+    assert list(buffer.lines) == text.split("\n") == ["\U0001f600 note", "", "15 m to ft"]
+
+
+def test_line_buffer_splits_on_text_view_line_breaks() -> None:
+    text = "5 m to ft\r12 in to mm\u20281 ft to m\r\n\u2029"
+    assert list(LineBuffer(text).lines) == ["5 m to ft", "12 in to mm", "1 ft to m", "", ""]
+
+
+def test_line_buffer_merges_and_splits_crlf_pairs() -> None:
+    text = "5 m to ft\r12 in to mm"
+    buffer = LineBuffer(text)
+    text = _edit(buffer, text, 10, 10, "\n")  # "\r" + "\n" becomes a single CRLF break
+    assert list(buffer.lines) == ["5 m to ft", "12 in to mm"]
+    text = _edit(buffer, text, 10, 10, "x")  # splitting the pair yields two breaks
+    assert list(buffer.lines) == ["5 m to ft", "x", "12 in to mm"]